@@ -1989,6 +1989,9 @@ class StringIO(_TextIOBase, bootstrap=True):
     def __init__(self, initial_value="", newline="\n"):
         _builtin()
 
+    def __iter__(self):
+        _builtin()
+
     def __next__(self):
         _builtin()
 
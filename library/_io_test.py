@@ -3386,6 +3386,47 @@ class StringIOTests(unittest.TestCase):
             closed.__iter__()
         self.assertRegex(str(context.exception), "I/O operation on closed file")
 
+    def test_iter_subclass_with_closed_property_raises_value_error(self):
+        class C(_io.StringIO):
+            @property
+            def closed(self):
+                return 1
+
+        string_io = C()
+        with self.assertRaises(ValueError) as context:
+            string_io.__iter__()
+        self.assertRegex(str(context.exception), "I/O operation on closed file")
+
+    def test_iter_subclass_with_open_property_and_closed_returns_self(self):
+        class C(_io.StringIO):
+            @property
+            def closed(self):
+                return False
+
+        string_io = C()
+        string_io.close()
+        self.assertIs(string_io.__iter__(), string_io)
+
+    def test_iter_subclass_and_open_returns_self(self):
+        class C(_io.StringIO):
+            pass
+
+        string_io = C()
+        self.assertIs(string_io.__iter__(), string_io)
+
+    @pyro_only
+    def test_iter_with_non_stringio_raises_type_error(self):
+        self.assertRaisesRegex(
+            TypeError,
+            r"'__iter__' .* '(_io\.)?StringIO' object.* a 'int'",
+            _io.StringIO.__iter__,
+            1,
+        )
+
+    def test_iter_yields_lines(self):
+        string_io = _io.StringIO("foo\nbar\nbaz")
+        self.assertEqual([line for line in string_io], ["foo\n", "bar\n", "baz"])
+
     def test_next_with_non_stringio_raises_type_error(self):
         self.assertRaisesRegex(
             TypeError,
@@ -3620,6 +3661,23 @@ class StringIOTests(unittest.TestCase):
         string_io = _io.StringIO("hello world\n")
         self.assertEqual(string_io.readline(5), "hello")
 
+    def test_readline_with_newline_none_stops_after_size(self):
+        string_io = _io.StringIO("hello\r\nworld", newline=None)
+        self.assertEqual(string_io.readline(3), "hel")
+        self.assertEqual(string_io.readline(3), "lo\n")
+        self.assertEqual(string_io.readline(3), "wor")
+
+    def test_readline_with_newline_empty_does_not_split_crlf_past_size(self):
+        string_io = _io.StringIO("ab\r\ncd", newline="")
+        self.assertEqual(string_io.readline(3), "ab\r")
+        self.assertEqual(string_io.readline(3), "\n")
+        self.assertEqual(string_io.readline(3), "cd")
+
+    def test_readline_with_crlf_newline_stops_after_size(self):
+        string_io = _io.StringIO("ab\ncd", newline="\r\n")
+        self.assertEqual(string_io.readline(3), "ab\r")
+        self.assertEqual(string_io.readline(), "\ncd")
+
     def test_readline_with_negative_size_full_line(self):
         string_io = _io.StringIO("hello world\n")
         self.assertEqual(string_io.readline(-5), "hello world\n")
@@ -3852,6 +3910,35 @@ class StringIOTests(unittest.TestCase):
         self.assertEqual(string_io.truncate(10), 10)
         self.assertEqual(string_io.getvalue(), "hello")
 
+    def test_truncate_past_end_then_write_appends(self):
+        string_io = _io.StringIO("hello")
+        self.assertEqual(string_io.truncate(10), 10)
+        string_io.seek(0, 2)
+        self.assertEqual(string_io.write(" world"), 6)
+        self.assertEqual(string_io.getvalue(), "hello world")
+
+    def test_truncate_with_huge_size_returns_size(self):
+        string_io = _io.StringIO("abc")
+        self.assertEqual(string_io.truncate(10 ** 10), 10 ** 10)
+        self.assertEqual(string_io.getvalue(), "abc")
+
+    def test_truncate_hides_truncated_contents(self):
+        string_io = _io.StringIO("hello\nworld\n")
+        self.assertEqual(string_io.truncate(3), 3)
+        self.assertEqual(string_io.getvalue(), "hel")
+        self.assertEqual(string_io.readline(), "hel")
+        self.assertEqual(string_io.seek(0, 2), 3)
+        string_io.seek(0)
+        self.assertEqual(string_io.read(), "hel")
+        string_io.seek(6)
+        self.assertEqual(string_io.write("x"), 1)
+        self.assertEqual(string_io.getvalue(), "hel\0\0\0x")
+
+    def test_truncate_with_newline_none_hides_truncated_newlines(self):
+        string_io = _io.StringIO("hello\nworld\n", newline=None)
+        string_io.truncate(3)
+        self.assertEqual(list(string_io), ["hel"])
+
     def test_write_with_open_writes_to_object(self):
         string_io = _io.StringIO()
         self.assertEqual(string_io.write("foobar"), 6)
@@ -3895,6 +3982,15 @@ class StringIOTests(unittest.TestCase):
         self.assertEqual(string_io.write("hello world"), 11)
         self.assertEqual(string_io.getvalue(), "hello world")
 
+    def test_write_with_strings_of_varying_length_copies_all_characters(self):
+        expected = ""
+        string_io = _io.StringIO()
+        for length in range(1, 20):
+            value = "".join(chr(ord("a") + i) for i in range(length))
+            self.assertEqual(string_io.write(value), length)
+            expected += value
+        self.assertEqual(string_io.getvalue(), expected)
+
     def test_write_with_overseek_pads_end_of_buffer_to_position_with_zeros(self):
         string_io = _io.StringIO("hello")
         string_io.seek(7)
@@ -3938,6 +4034,22 @@ class StringIOTests(unittest.TestCase):
         self.assertEqual(string_io.newlines, ("\r", "\n", "\r\n"))
         self.assertEqual(string_io.getvalue(), "foo\nbar\nbaz\n")
 
+    def test_write_with_newline_none_and_no_newlines_stores_no_newlines(self):
+        string_io = _io.StringIO(newline=None)
+        self.assertEqual(string_io.write("foo"), 3)
+        self.assertEqual(string_io.newlines, None)
+        self.assertEqual(string_io.write("bar\nbaz"), 7)
+        self.assertEqual(string_io.newlines, "\n")
+        self.assertEqual(string_io.getvalue(), "foobar\nbaz")
+
+    def test_write_with_newline_none_and_only_crlf_stores_crlf(self):
+        string_io = _io.StringIO(newline=None)
+        self.assertEqual(string_io.write("a\r\nb\r\n"), 6)
+        self.assertEqual(string_io.newlines, "\r\n")
+        self.assertEqual(string_io.write("\r"), 1)
+        self.assertEqual(string_io.newlines, ("\r", "\r\n"))
+        self.assertEqual(string_io.getvalue(), "a\nb\n\n")
+
     def test_writable_with_open_StringIO_returns_true(self):
         string_io = _io.StringIO()
         self.assertTrue(string_io.writable())
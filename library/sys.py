@@ -8,13 +8,15 @@ from _builtins import (
     _builtin,
     _get_asyncgen_hooks,
     _int_check,
+    _int_check_exact,
+    _object_type_getattr,
     _structseq_new_type,
     _Unbound,
     _unimplemented,
 )
 from _builtins import maxunicode  # noqa: F401
 from _io import TextIOWrapper
-from _path import dirname as _dirname, join as _join
+from _path import dirname as _dirname, isfile as _isfile, join as _join
 
 
 # These values are all injected by our boot process. flake8 has no knowledge
@@ -111,23 +113,29 @@ def _init(
 
     executable_dir = _dirname(executable)
     cfg = None
-    try:
-        cfg = open(_join(executable_dir, "pyvenv.cfg"), "r", encoding="utf-8")
-    except IOError as e:
-        try:
-            cfg = open(_join(executable_dir, "..", "pyvenv.cfg"), "r", encoding="utf-8")
-        except IOError as e:
-            pass
+    # Most runs are outside of a venv; stat first so that the common case does
+    # not raise and catch an exception per candidate.
+    for cfg_path in (
+        _join(executable_dir, "pyvenv.cfg"),
+        _join(executable_dir, "..", "pyvenv.cfg"),
+    ):
+        if _isfile(cfg_path):
+            try:
+                cfg = open(cfg_path, "r", encoding="utf-8")
+                break
+            except IOError:
+                pass
 
     if cfg is not None:
         with cfg:
-            for line in cfg:
-                if line[0] == "#":
-                    continue
-                tokens = line.split()
-                if len(tokens) >= 3 and tokens[0] == "home" and tokens[1] == "=":
-                    executable_dir = tokens[2]
-                    break
+            lines = cfg.read().split("\n")
+        for line in lines:
+            if line.startswith("#"):
+                continue
+            tokens = line.split()
+            if len(tokens) >= 3 and tokens[0] == "home" and tokens[1] == "=":
+                executable_dir = tokens[2]
+                break
 
     _prefix = _join(executable_dir, "..")
 
@@ -144,7 +152,7 @@ def _init(
     path = _python_path
     if extend_python_path_with_stdlib:
         stdlib_dir = _join(
-            _prefix, "lib", f"{implementation.name}{_version.major}.{_version.minor}"
+            _prefix, "lib", f"{implementation.name}{_version_major}.{_version_minor}"
         )
         path.append(stdlib_dir)
 
@@ -162,14 +170,23 @@ if _use_buffered_stdio:
 
     __stdout__ = open(_stdout_fd, "w", buffering=-1, closefd=False, encoding="utf-8")
 else:
-    __stderr__ = open(_stderr_fd, "wb", buffering=False, closefd=False)
-    __stderr__ = TextIOWrapper(__stderr__, encoding="utf-8", line_buffering=False)
+    __stderr__ = TextIOWrapper(
+        open(_stderr_fd, "wb", buffering=False, closefd=False),
+        encoding="utf-8",
+        line_buffering=False,
+    )
 
-    __stdin__ = open(_stdin_fd, "rb", buffering=False, closefd=False)
-    __stdin__ = TextIOWrapper(__stdin__, encoding="utf-8", line_buffering=False)
+    __stdin__ = TextIOWrapper(
+        open(_stdin_fd, "rb", buffering=False, closefd=False),
+        encoding="utf-8",
+        line_buffering=False,
+    )
 
-    __stdout__ = open(_stdout_fd, "wb", buffering=False, closefd=False)
-    __stdout__ = TextIOWrapper(__stdout__, encoding="utf-8", line_buffering=False)
+    __stdout__ = TextIOWrapper(
+        open(_stdout_fd, "wb", buffering=False, closefd=False),
+        encoding="utf-8",
+        line_buffering=False,
+    )
 
 
 _base_executable = None  # will be set by _init
@@ -178,10 +195,16 @@ _base_executable = None  # will be set by _init
 _framework = ""
 
 
+_version_major = (hexversion >> 24) & 0xFF
+
+
+_version_minor = (hexversion >> 16) & 0xFF
+
+
 _version = _VersionInfo(
     (
-        (hexversion >> 24) & 0xFF,  # major
-        (hexversion >> 16) & 0xFF,  # minor
+        _version_major,
+        _version_minor,
         (hexversion >> 8) & 0xFF,  # micro
         _version_releaselevel,  # releaselevel
         hexversion & 0x0F,  # serial
@@ -303,21 +326,19 @@ def getrecursionlimit():
 
 def getsizeof(object, default=_Unbound):
     # It is possible (albeit difficult) to define a class without __sizeof__
-    try:
-        cls = type(object)
-        size = cls.__sizeof__
-    except AttributeError:
+    size = _object_type_getattr(object, "__sizeof__")
+    if size is _Unbound:
         if default is _Unbound:
-            raise TypeError(f"Type {cls.__name__} doesn't define __sizeof__")
+            raise TypeError(f"Type {type(object).__name__} doesn't define __sizeof__")
         return default
-    result = size(object)
+    result = size()
     if not _int_check(result):
         if default is _Unbound:
             raise TypeError("an integer is required")
         return default
     if result < 0:
         raise ValueError("__sizeof__() should return >= 0")
-    return int(result)
+    return result if _int_check_exact(result) else int(result)
 
 
 def gettrace():
@@ -325,7 +346,9 @@ def gettrace():
 
 
 implementation = _SimpleNamespace(
-    cache_tag=f"skybison-{_version.major}{_version.minor}", name="skybison", version=_version
+    cache_tag=f"skybison-{_version_major}{_version_minor}",
+    name="skybison",
+    version=_version,
 )
 
 
@@ -228,6 +228,20 @@ class SysTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             sys.getsizeof(C())
 
+    @pyro_only
+    def test_getsizeof_without_dunder_sizeof_returns_default(self):
+        class M(type):
+            def mro(cls):
+                return (cls,)
+
+        class C(metaclass=M):
+            pass
+
+        instance = object.__new__(C)
+        self.assertEqual(sys.getsizeof(instance, 42), 42)
+        with self.assertRaisesRegex(TypeError, "doesn't define __sizeof__"):
+            sys.getsizeof(instance)
+
     def test_getsizeof_with_non_int_without_default_raises_type_error(self):
         class C:
             def __sizeof__(self):
@@ -3937,6 +3937,9 @@ class RawStringIO : public RawUnderTextIOBase {
   RawObject buffer() const;
   void setBuffer(RawObject buffer) const;
 
+  word numItems() const;
+  void setNumItems(word num_items) const;
+
   word pos() const;
   void setPos(word new_pos) const;
 
@@ -3972,7 +3975,8 @@ class RawStringIO : public RawUnderTextIOBase {
 
   // Layout
   static const int kBufferOffset = RawUnderTextIOBase::kSize;
-  static const int kPosOffset = kBufferOffset + kPointerSize;
+  static const int kNumItemsOffset = kBufferOffset + kPointerSize;
+  static const int kPosOffset = kNumItemsOffset + kPointerSize;
   static const int kReadnlOffset = kPosOffset + kPointerSize;
   static const int kReadtranslateOffset = kReadnlOffset + kPointerSize;
   static const int kReaduniversalOffset = kReadtranslateOffset + kPointerSize;
@@ -7973,6 +7977,14 @@ inline void RawStringIO::setBuffer(RawObject buffer) const {
   instanceVariableAtPut(kBufferOffset, buffer);
 }
 
+inline word RawStringIO::numItems() const {
+  return RawSmallInt::cast(instanceVariableAt(kNumItemsOffset)).value();
+}
+
+inline void RawStringIO::setNumItems(word num_items) const {
+  instanceVariableAtPut(kNumItemsOffset, RawSmallInt::fromWord(num_items));
+}
+
 inline word RawStringIO::pos() const {
   return RawSmallInt::cast(instanceVariableAt(kPosOffset)).value();
 }
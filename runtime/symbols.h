@@ -116,6 +116,7 @@ class Runtime;
   V(_HashInfo)                                                                 \
   V(_IOBase)                                                                   \
   V(_RawIOBase)                                                                \
+  V(_StringIO__num_items)                                                      \
   V(_TextIOBase)                                                               \
   V(_Unbound)                                                                  \
   V(_UnboundType)                                                              \
@@ -580,6 +581,7 @@ class Runtime;
   V(cell)                                                                      \
   V(cell_contents)                                                             \
   V(classmethod)                                                               \
+  V(closed)                                                                    \
   V(co_argcount)                                                               \
   V(co_cellvars)                                                               \
   V(co_code)                                                                   \
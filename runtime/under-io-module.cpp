@@ -8,6 +8,7 @@
 #include "frame.h"
 #include "globals.h"
 #include "int-builtins.h"
+#include "interpreter.h"
 #include "modules.h"
 #include "object-builtins.h"
 #include "objects.h"
@@ -20,6 +21,21 @@
 
 namespace py {
 
+// Raise `type` with a fixed `message`. The message is interned, so repeated
+// raises reuse one str instead of formatting a new one each time.
+static NEVER_INLINE RawObject raiseWithInternedMessage(Thread* thread,
+                                                       LayoutId type,
+                                                       const char* message) {
+  return thread->raise(type, Runtime::internStrFromCStr(thread, message));
+}
+
+// Closed files are the uncommon case; keep raising out of line so the checks
+// at the top of each method stay small.
+static NEVER_INLINE RawObject raiseClosedFileError(Thread* thread) {
+  return raiseWithInternedMessage(thread, LayoutId::kValueError,
+                                  "I/O operation on closed file.");
+}
+
 RawObject FUNC(_io, _BytesIO_guard)(Thread* thread, Arguments args) {
   HandleScope scope(thread);
   Object self_obj(&scope, args.get(0));
@@ -37,8 +53,7 @@ RawObject FUNC(_io, _BytesIO_closed_guard)(Thread* thread, Arguments args) {
   }
   BytesIO self(&scope, *self_obj);
   if (self.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   return NoneType::object();
 }
@@ -63,8 +78,7 @@ RawObject FUNC(_io, _BytesIO_seek)(Thread* thread, Arguments args) {
   }
   BytesIO self(&scope, *self_obj);
   if (self.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
 
   Int offset_int(&scope, intUnderlying(*offset_obj));
@@ -114,8 +128,7 @@ RawObject FUNC(_io, _BytesIO_truncate)(Thread* thread, Arguments args) {
   }
   BytesIO bytes_io(&scope, *self);
   if (bytes_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object size_obj(&scope, args.get(1));
   word size;
@@ -152,8 +165,7 @@ RawObject FUNC(_io, _StringIO_closed_guard)(Thread* thread, Arguments args) {
   }
   StringIO self(&scope, *self_obj);
   if (self.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   return NoneType::object();
 }
@@ -173,8 +185,7 @@ RawObject FUNC(_io, _StringIO_seek)(Thread* thread, Arguments args) {
   }
   StringIO self(&scope, *self_obj);
   if (self.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   word offset = intUnderlying(*offset_obj).asWordSaturated();
   if (!SmallInt::isValid(offset)) {
@@ -183,8 +194,8 @@ RawObject FUNC(_io, _StringIO_seek)(Thread* thread, Arguments args) {
         "cannot fit offset into an index-sized integer");
   }
   if (!runtime->isInstanceOfInt(*whence_obj)) {
-    return thread->raiseWithFmt(LayoutId::kTypeError,
-                                "Invalid whence (should be 0, 1 or 2)");
+    return raiseWithInternedMessage(thread, LayoutId::kTypeError,
+                                    "Invalid whence (should be 0, 1 or 2)");
   }
   word whence = intUnderlying(*whence_obj).asWordSaturated();
   switch (whence) {
@@ -197,16 +208,16 @@ RawObject FUNC(_io, _StringIO_seek)(Thread* thread, Arguments args) {
       return *offset_obj;
     case 1:
       if (offset != 0) {
-        return thread->raiseWithFmt(LayoutId::kOSError,
-                                    "Can't do nonzero cur-relative seeks");
+        return raiseWithInternedMessage(thread, LayoutId::kOSError,
+                                        "Can't do nonzero cur-relative seeks");
       }
       return SmallInt::fromWord(self.pos());
     case 2: {
       if (offset != 0) {
-        return thread->raiseWithFmt(LayoutId::kOSError,
-                                    "Can't do nonzero end-relative seeks");
+        return raiseWithInternedMessage(thread, LayoutId::kOSError,
+                                        "Can't do nonzero end-relative seeks");
       }
-      word new_pos = MutableBytes::cast(self.buffer()).length();
+      word new_pos = self.numItems();
       self.setPos(new_pos);
       return SmallInt::fromWord(new_pos);
     }
@@ -802,8 +813,7 @@ RawObject FUNC(_io, _TextIOWrapper_attached_closed_guard)(Thread* thread,
   if (runtime->isInstanceOfBufferedReader(*buffer_obj)) {
     BufferedReader buffer(&scope, *buffer_obj);
     if (buffer.closed()) {
-      return thread->raiseWithFmt(LayoutId::kValueError,
-                                  "I/O operation on closed file.");
+      return raiseClosedFileError(thread);
     }
     return NoneType::object();
   }
@@ -813,8 +823,7 @@ RawObject FUNC(_io, _TextIOWrapper_attached_closed_guard)(Thread* thread,
     if (!buffer.closed()) {
       return NoneType::object();
     }
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   // TODO(T61927696): Add closed check support for other types of buffer
   return Unbound::object();
@@ -838,8 +847,7 @@ RawObject FUNC(_io,
   if (runtime->isInstanceOfBufferedReader(*buffer_obj)) {
     BufferedReader buffer(&scope, *buffer_obj);
     if (buffer.closed()) {
-      return thread->raiseWithFmt(LayoutId::kValueError,
-                                  "I/O operation on closed file.");
+      return raiseClosedFileError(thread);
     }
     // TODO(T61927696): change this when TextIOWrapper.seekable() returns bool
     Object seekable_obj(&scope, self.seekable());
@@ -861,8 +869,7 @@ RawObject FUNC(_io,
       }
       return NoneType::object();
     }
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
 
   // TODO(T61927696): Add closed check support for other types of buffer
@@ -1100,8 +1107,7 @@ RawObject METH(BytesIO, getvalue)(Thread* thread, Arguments args) {
   }
   BytesIO bytes_io(&scope, *self);
   if (bytes_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Bytes buffer(&scope, bytes_io.buffer());
   word num_items = bytes_io.numItems();
@@ -1117,8 +1123,7 @@ RawObject METH(BytesIO, read)(Thread* thread, Arguments args) {
   }
   BytesIO bytes_io(&scope, *self);
   if (bytes_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
 
   Object size_obj(&scope, args.get(1));
@@ -1163,8 +1168,7 @@ RawObject METH(BytesIO, write)(Thread* thread, Arguments args) {
   }
   BytesIO bytes_io(&scope, *self);
   if (bytes_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
 
   Object value_obj(&scope, args.get(1));
@@ -1211,8 +1215,7 @@ RawObject METH(FileIO, readall)(Thread* thread, Arguments args) {
   }
   FileIO file_io(&scope, *self);
   if (file_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object fd_obj(&scope, file_io.fd());
   DCHECK(fd_obj.isSmallInt(), "fd must be small int");
@@ -1287,8 +1290,7 @@ RawObject METH(FileIO, readinto)(Thread* thread, Arguments args) {
   }
   FileIO file_io(&scope, *self);
   if (file_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object dst_obj(&scope, args.get(1));
   if (!runtime->isByteslike(*dst_obj) && !runtime->isInstanceOfMmap(*dst_obj)) {
@@ -1343,6 +1345,8 @@ RawObject METH(FileIO, readinto)(Thread* thread, Arguments args) {
 
 static const BuiltinAttribute kStringIOAttributes[] = {
     {ID(_buffer), RawStringIO::kBufferOffset},
+    {ID(_StringIO__num_items), RawStringIO::kNumItemsOffset,
+     AttributeFlags::kReadOnly},
     {ID(_pos), RawStringIO::kPosOffset},
     {ID(_readnl), RawStringIO::kReadnlOffset},
     {ID(_readtranslate), RawStringIO::kReadtranslateOffset},
@@ -1353,11 +1357,26 @@ static const BuiltinAttribute kStringIOAttributes[] = {
 };
 
 enum NewlineFound { kLF = 0x1, kCR = 0x2, kCRLF = 0x4 };
+static_assert(NewlineFound::kLF == 1 && NewlineFound::kCR << 1 == kCRLF,
+              "stringIOWrite updates the seen newlines without branching");
+
+static void stringIOEnsureCapacity(Thread* thread, const StringIO& string_io,
+                                   word min_capacity) {
+  DCHECK_BOUND(min_capacity, SmallInt::kMaxValue);
+  HandleScope scope(thread);
+  MutableBytes curr_buffer(&scope, string_io.buffer());
+  word curr_capacity = curr_buffer.length();
+  if (min_capacity <= curr_capacity) return;
+  word new_capacity = Runtime::newCapacity(curr_capacity, min_capacity);
+  MutableBytes new_buffer(
+      &scope, thread->runtime()->newMutableBytesUninitialized(new_capacity));
+  new_buffer.replaceFromWith(0, *curr_buffer, string_io.numItems());
+  string_io.setBuffer(*new_buffer);
+}
 
 static RawObject stringIOWrite(Thread* thread, const StringIO& string_io,
                                const Str& value) {
   HandleScope scope(thread);
-  Runtime* runtime = thread->runtime();
   if (*value == Str::empty()) {
     return SmallInt::fromWord(0);
   }
@@ -1380,19 +1399,27 @@ static RawObject stringIOWrite(Thread* thread, const StringIO& string_io,
   word start = string_io.pos();
   word new_len = start + val_len;
   bool has_read_translate = string_io.hasReadtranslate();
+  if (has_read_translate && strFindAsciiChar(value, '\r') == -1) {
+    // Only '\r' needs translating, so the common case is a plain copy
+    has_read_translate = false;
+    if (strFindAsciiChar(value, '\n') != -1) {
+      word seen_nl = Int::cast(string_io.seennl()).asWord();
+      string_io.setSeennl(SmallInt::fromWord(seen_nl | NewlineFound::kLF));
+    }
+  }
   if (has_read_translate) {
     new_len -= value.occurrencesOf(SmallStr::fromCStr("\r\n"));
   }
 
+  stringIOEnsureCapacity(thread, string_io, new_len);
   MutableBytes buffer(&scope, string_io.buffer());
-  word old_len = buffer.length();
+  word old_len = string_io.numItems();
+  if (old_len < start) {
+    // Writing past the end pads the gap with zeros
+    buffer.replaceFromWithByte(old_len, 0, start - old_len);
+  }
   if (old_len < new_len) {
-    MutableBytes new_buffer(&scope,
-                            runtime->newMutableBytesUninitialized(new_len));
-    new_buffer.replaceFromWith(0, *buffer, old_len);
-    new_buffer.replaceFromWithByte(old_len, 0, new_len - old_len);
-    string_io.setBuffer(*new_buffer);
-    buffer = *new_buffer;
+    string_io.setNumItems(new_len);
   }
 
   if (has_read_translate) {
@@ -1400,18 +1427,13 @@ static RawObject stringIOWrite(Thread* thread, const StringIO& string_io,
     for (word str_i = 0, byte_i = start; str_i < val_len; ++str_i, ++byte_i) {
       byte ch = value.byteAt(str_i);
       if (ch == '\r') {
-        if (val_len > str_i + 1 && value.byteAt(str_i + 1) == '\n') {
-          new_seen_nl |= NewlineFound::kCRLF;
-          buffer.byteAtPut(byte_i, '\n');
-          str_i++;
-          continue;
-        }
-        new_seen_nl |= NewlineFound::kCR;
-        buffer.byteAtPut(byte_i, '\n');
-        continue;
-      }
-      if (ch == '\n') {
-        new_seen_nl |= NewlineFound::kLF;
+        word is_crlf = val_len > str_i + 1 && value.byteAt(str_i + 1) == '\n';
+        // kCR shifted by one is kCRLF
+        new_seen_nl |= NewlineFound::kCR << is_crlf;
+        str_i += is_crlf;
+        ch = '\n';
+      } else {
+        new_seen_nl |= static_cast<word>(ch == '\n');
       }
       buffer.byteAtPut(byte_i, ch);
     }
@@ -1465,6 +1487,7 @@ RawObject METH(StringIO, __init__)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   string_io.setBuffer(runtime->emptyMutableBytes());
+  string_io.setNumItems(0);
   string_io.setClosed(false);
   string_io.setPos(0);
   string_io.setReadnl(*newline);
@@ -1500,65 +1523,81 @@ RawObject METH(StringIO, __init__)(Thread* thread, Arguments args) {
   return NoneType::object();
 }
 
+// Returns the end of the line that starts at `start`, looking no further than
+// `limit`.
+static word stringIOFindLineEnd(const StringIO& string_io,
+                                const MutableBytes& buffer, word start,
+                                word limit) {
+  if (string_io.hasReadtranslate()) {
+    // Writes already translated every newline to '\n'
+    word index = buffer.findByte('\n', start, limit - start);
+    return index == -1 ? limit : index + 1;
+  }
+  if (string_io.hasReaduniversal()) {
+    for (word i = start; i < limit; i++) {
+      byte ch = buffer.byteAt(i);
+      if (ch == '\n') return i + 1;
+      if (ch == '\r') {
+        return i + 1 < limit && buffer.byteAt(i + 1) == '\n' ? i + 2 : i + 1;
+      }
+    }
+    return limit;
+  }
+  RawStr newline = Str::cast(string_io.readnl());
+  byte first_nl_byte = newline.byteAt(0);
+  bool long_newline = newline.length() == 2;
+  for (word i = start; i < limit;) {
+    word index = buffer.findByte(first_nl_byte, i, limit - i);
+    if (index == -1) break;
+    i = index + 1;
+    if (!long_newline) return i;
+    if (i < limit && buffer.byteAt(i) == newline.byteAt(1)) return i + 1;
+  }
+  return limit;
+}
+
+// Advances past the next line and returns its end, or -1 at end of stream.
+// A negative `size` reads the whole line.
 static word stringIOReadline(Thread* thread, const StringIO& string_io,
                              word size) {
-  HandleScope scope(thread);
-  MutableBytes buffer(&scope, string_io.buffer());
-  word buf_len = buffer.length();
   word start = string_io.pos();
-  if (start >= buf_len) {
+  word limit = string_io.numItems();
+  if (start >= limit) {
     return -1;
   }
-  bool has_read_universal = string_io.hasReaduniversal();
-  bool has_read_translate = string_io.hasReadtranslate();
-  Object newline_obj(&scope, string_io.readnl());
-  if (has_read_translate) {
-    newline_obj = SmallStr::fromCodePoint('\n');
-  }
-  Str newline(&scope, *newline_obj);
-  if (size < 0 || (size + start) > buf_len) {
-    size = buf_len - start;
+  if (size >= 0 && size < limit - start) {
+    limit = start + size;
   }
-  word i = start;
+  HandleScope scope(thread);
+  MutableBytes buffer(&scope, string_io.buffer());
+  word end = stringIOFindLineEnd(string_io, buffer, start, limit);
+  string_io.setPos(end);
+  return end;
+}
 
-  if (has_read_universal) {
-    const byte crlf[] = {'\r', '\n'};
-    i = buffer.indexOfAny(crlf, start);
-    // when this condition is met, either '\r' or '\n' is found
-    if (buf_len > i) {
-      // ch is the '\n' or '\r'
-      byte ch = buffer.byteAt(i++);
-      if (ch == '\r') {
-        if (buf_len > i && buffer.byteAt(i) == '\n') {
-          i++;
-        }
-      }
-    }
-  } else {
-    byte first_nl_byte = newline.byteAt(0);
-    while (i < start + size) {
-      word index = buffer.findByte(first_nl_byte, i, (size + start - i));
-      if (index == -1) {
-        i += (size + start - i);
-        break;
-      }
-      i = index + 1;
-      if (buf_len >= (i + newline.length() - 1)) {
-        bool match = true;
-        for (int j = 1; j < newline.length(); j++) {
-          if (buffer.byteAt(i + j - 1) != newline.byteAt(j)) {
-            match = false;
-          }
-        }
-        if (match) {
-          i += (newline.length() - 1);
-          break;
-        }
-      }
-    }
+RawObject METH(StringIO, __iter__)(Thread* thread, Arguments args) {
+  HandleScope scope(thread);
+  Runtime* runtime = thread->runtime();
+  Object self(&scope, args.get(0));
+  if (!runtime->isInstanceOfStringIO(*self)) {
+    return thread->raiseRequiresType(self, ID(StringIO));
   }
-  string_io.setPos(i);
-  return i;
+  if (self.isStringIO()) {
+    if (StringIO::cast(*self).closed()) {
+      return raiseClosedFileError(thread);
+    }
+    return *self;
+  }
+  // Subclasses may shadow `closed`, so consult the attribute like
+  // `_IOBase._checkClosed` does.
+  Object closed(&scope, runtime->attributeAtById(thread, self, ID(closed)));
+  if (closed.isErrorException()) return *closed;
+  closed = Interpreter::isTrue(thread, *closed);
+  if (closed.isErrorException()) return *closed;
+  if (closed == Bool::trueObj()) {
+    return raiseClosedFileError(thread);
+  }
+  return *self;
 }
 
 RawObject METH(StringIO, __next__)(Thread* thread, Arguments args) {
@@ -1569,8 +1608,7 @@ RawObject METH(StringIO, __next__)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   word start = string_io.pos();
   word end = stringIOReadline(thread, string_io, -1);
@@ -1602,11 +1640,10 @@ RawObject METH(StringIO, getvalue)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Bytes buffer(&scope, string_io.buffer());
-  buffer = runtime->bytesCopy(thread, buffer);
+  buffer = runtime->bytesCopyWithSize(thread, buffer, string_io.numItems());
   return buffer.becomeStr();
 }
 
@@ -1618,8 +1655,7 @@ RawObject METH(StringIO, read)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object size_obj(&scope, args.get(1));
   word size;
@@ -1638,7 +1674,7 @@ RawObject METH(StringIO, read)(Thread* thread, Arguments args) {
   }
   Bytes result(&scope, string_io.buffer());
   word start = string_io.pos();
-  word end = result.length();
+  word end = string_io.numItems();
   if (start > end) {
     return Str::empty();
   }
@@ -1661,8 +1697,7 @@ RawObject METH(StringIO, readline)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object size_obj(&scope, args.get(1));
   word size;
@@ -1698,8 +1733,7 @@ RawObject METH(StringIO, truncate)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object size_obj(&scope, args.get(1));
   word size;
@@ -1720,12 +1754,8 @@ RawObject METH(StringIO, truncate)(Thread* thread, Arguments args) {
                                   "Negative size value %d", size);
     }
   }
-  MutableBytes buffer(&scope, string_io.buffer());
-  if (size < buffer.length()) {
-    MutableBytes new_buffer(&scope,
-                            runtime->newMutableBytesUninitialized(size));
-    new_buffer.replaceFromWith(0, *buffer, size);
-    string_io.setBuffer(*new_buffer);
+  if (size < string_io.numItems()) {
+    string_io.setNumItems(size);
   }
   return SmallInt::fromWord(size);
 }
@@ -1739,8 +1769,7 @@ RawObject METH(StringIO, write)(Thread* thread, Arguments args) {
   }
   StringIO string_io(&scope, *self);
   if (string_io.closed()) {
-    return thread->raiseWithFmt(LayoutId::kValueError,
-                                "I/O operation on closed file.");
+    return raiseClosedFileError(thread);
   }
   Object value(&scope, args.get(1));
   if (!runtime->isInstanceOfStr(*value)) {